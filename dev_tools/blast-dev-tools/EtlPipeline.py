@@ -0,0 +1,104 @@
+"""
+Extract, Transform, Load (ETL) Pipeline class
+"""
+import os
+import queue
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, wait
+from blast_defaults import SUCCESS, FAILURE
+from blast_logging import log_exception, log_info
+from blast_datetime import RunClock
+
+MODULE_PATH = Path(__file__).resolve()
+CWD_PATH = Path(__file__).resolve().parent
+# marks end of stage input, one per worker of the receiving stage
+STAGE_DONE = None
+
+
+class EtlPipeline:
+    """ EtlPipeline class: runs many EtlProcessors as extract -> load -> transform pipeline,
+    while one processor transforms the next can load and another can extract """
+
+    def __init__(
+            self,
+            etl_processors: list,
+            extract_workers: int = 8,
+            load_workers: int = 2,
+            transform_workers: int = None,
+            logger=None,
+    ):
+        """ initialize class """
+        self.__cls_name = f"{type(self).__name__}"
+        self.__etl_processors = list(etl_processors)
+        # extract is IO bound, load is capped by database concurrency, transform by cpu cores
+        self.__extract_workers = extract_workers
+        self.__load_workers = load_workers
+        self.__transform_workers = transform_workers or os.cpu_count() or 1
+        self.__logger = logger
+
+    def __str__(self) -> str:
+        """returns informal name of class, called by str()"""
+        return f"{self.__cls_name} {len(self.__etl_processors)} processors"
+
+    def __repr__(self) -> str:
+        """returns official string representation of class, called by repr()"""
+        return (f"{self.__cls_name} {len(self.__etl_processors)} processors "
+                f"extract_workers: {self.__extract_workers} "
+                f"load_workers: {self.__load_workers} "
+                f"transform_workers: {self.__transform_workers}")
+
+    def run(self) -> list:
+        """ runs every processor through all stages, returns [successful] in etl_processors order
+        (list, not keyed by name: processors may share a staging table name) """
+        method = "run()"
+        extract_queue = queue.Queue()
+        # bounded hand-offs: a fast stage waits for a slow stage instead of piling up work
+        load_queue = queue.Queue(maxsize=self.__load_workers)
+        transform_queue = queue.Queue(maxsize=self.__transform_workers)
+        # one clock per run: every processor stamps the same etl_pull_date
+        run_clock = RunClock()
+        for etl_processor in self.__etl_processors:
+            etl_processor.set_run_clock(run_clock)
+            extract_queue.put(etl_processor)
+        for _ in range(self.__extract_workers):
+            extract_queue.put(STAGE_DONE)
+        with ThreadPoolExecutor(self.__extract_workers, thread_name_prefix="extract") as extract_pool, \
+                ThreadPoolExecutor(self.__load_workers, thread_name_prefix="load") as load_pool, \
+                ThreadPoolExecutor(self.__transform_workers, thread_name_prefix="transform") as transform_pool:
+            extract_futures = [
+                extract_pool.submit(self.__stage_worker, "extract", extract_queue, load_queue)
+                for _ in range(self.__extract_workers)
+            ]
+            load_futures = [
+                load_pool.submit(self.__stage_worker, "load", load_queue, transform_queue)
+                for _ in range(self.__load_workers)
+            ]
+            transform_futures = [
+                transform_pool.submit(self.__stage_worker, "transform", transform_queue, None)
+                for _ in range(self.__transform_workers)
+            ]
+            # stage boundary: next stage ends once all workers of previous stage are done
+            wait(extract_futures)
+            for _ in range(self.__load_workers):
+                load_queue.put(STAGE_DONE)
+            wait(load_futures)
+            for _ in range(self.__transform_workers):
+                transform_queue.put(STAGE_DONE)
+            wait(transform_futures)
+        results = [etl_processor.successful() for etl_processor in self.__etl_processors]
+        for index, (etl_processor, successful) in enumerate(zip(self.__etl_processors, results)):
+            log_info(logger=self.__logger, msg=f"{method} {SUCCESS if successful else FAILURE} #{index} '{etl_processor}'")
+        return results
+
+    def __stage_worker(self, stage: str, in_queue: queue.Queue, out_queue: queue.Queue) -> None:
+        """ runs stage method (extract, load, transform) of each processor from in_queue, hands off to out_queue """
+        while True:
+            etl_processor = in_queue.get()
+            if etl_processor is STAGE_DONE:
+                break
+            try:
+                getattr(etl_processor, stage)()
+            except Exception:
+                log_exception(logger=self.__logger, error_msg=f"{stage}() {FAILURE} '{etl_processor}'")
+            if out_queue is not None:
+                out_queue.put(etl_processor)
@@ -3,7 +3,11 @@ Extract, Transform, Load (ETL) Processor class
 """
 import os
 import sys
-import inspect
+import time
+import select
+import signal
+import asyncio
+import selectors
 import subprocess
 import pprint as pp
 from pathlib import Path
@@ -11,11 +15,50 @@ from blast_defaults import SUCCESS, FAILURE
 
 MODULE_PATH = Path(__file__).resolve()
 CWD_PATH = Path(__file__).resolve().parent
+# seconds to wait for extractor subprocess
+EXTRACT_TIMEOUT = 240
+# common shell exit codes, subprocess return codes are not errno values
+EXIT_CODES = {
+    1: "generic error",
+    2: "misuse",
+    126: "not executable",
+    127: "not found",
+    130: "SIGINT",
+}
+
+
+def get_exit_reason(returncode: int) -> str:
+    """returns reason for non-zero subprocess return code (negative: killed by signal)"""
+    if returncode < 0:
+        try:
+            return signal.Signals(-returncode).name
+        except ValueError:
+            return f"signal {-returncode}"
+    return EXIT_CODES.get(returncode, f"rc={returncode}")
 
 
 class EtlProcessor:
     """ EtlProcessor class """
 
+    # fixed attribute layout (no per-instance __dict__), names as mangled by private self.__attr
+    __slots__ = (
+        "_EtlProcessor__cls_name",
+        "_EtlProcessor__staging_table",
+        "_EtlProcessor__extractor_path",
+        "_EtlProcessor__cmd_args",
+        "_EtlProcessor__loader",
+        "_EtlProcessor__transformer",
+        "_EtlProcessor__run_clock",
+        "_EtlProcessor__logger",
+        "_EtlProcessor__debug",
+        "_EtlProcessor__run_extract",
+        "_EtlProcessor__run_load",
+        "_EtlProcessor__run_transform",
+        "_EtlProcessor__is_extracted",
+        "_EtlProcessor__is_loaded",
+        "_EtlProcessor__is_transformed",
+    )
+
     def __init__(
             self,
             staging_table: str,
@@ -23,6 +66,7 @@ class EtlProcessor:
             cmd_args: list,
             loader,
             transformer,
+            run_clock=None,
             run_extract=True,
             run_load=True,
             run_transform=True,
@@ -38,6 +82,8 @@ class EtlProcessor:
         self.__cmd_args.extend([str(val) for val in cmd_args])
         self.__loader = loader
         self.__transformer = transformer
+        # RunClock shared by every processor of one run (same etl_pull_date)
+        self.__run_clock = run_clock
         self.__logger = logger
         self.__debug = debug
         # what needs to happen
@@ -63,7 +109,8 @@ class EtlProcessor:
     def show_state(self) -> None:
         """displays all class variables (types and values)"""
         print(f"\n{MODULE_PATH}")
-        for key, val in self.__dict__.items():
+        for key in self.__slots__:
+            val = getattr(self, key)
             print(f"self.{key:36} {str(type(val)):36}\t '{val}'")
 
     def show_data(self, title: str, data) -> None:
@@ -96,55 +143,185 @@ class EtlProcessor:
 
     def run(self) -> None:
         """ run the data retrieval and ETL processing """
-        method = f"{inspect.currentframe().f_code.co_name}()"
+        method = "run()"
+        try:
+            self.extract()
+            self.load()
+            self.transform()
+        except Exception:
+            self.__log_exception(error_msg=f"{method} {FAILURE} '{self.__staging_table}'")
+
+    async def run_async(self) -> None:
+        """ run the data retrieval and ETL processing, many processors can be awaited with asyncio.gather() """
+        method = "run_async()"
         try:
-            # extract from data source
-            if self.__run_extract:
-                self.extract()
-            # proceed with loading
-            if self.__run_load and self.extracted():
-                self.__loader.load()
-                self.__is_loaded = self.__loader.loaded()
-            # checks extractor and loader state
-            if self.__run_transform and self.extracted() and self.loaded():
-                self.__transformer.transform()
-                self.__is_transformed = self.__transformer.transformed()
+            await self.extract_async()
+            # loader and transformer in thread so event loop is not blocked
+            await asyncio.to_thread(self.load)
+            await asyncio.to_thread(self.transform)
         except Exception:
             self.__log_exception(error_msg=f"{method} {FAILURE} '{self.__staging_table}'")
 
+    def set_run_clock(self, run_clock) -> None:
+        """ sets RunClock of current run, handed to loader/transformer before they run """
+        self.__run_clock = run_clock
+
+    def run_clock(self):
+        """ returns RunClock of current run (None if not set) """
+        return self.__run_clock
+
+    def __share_run_clock(self, stage) -> None:
+        """ hands run clock to loader/transformer implementing set_run_clock(run_clock) """
+        if self.__run_clock is not None and hasattr(stage, "set_run_clock"):
+            stage.set_run_clock(self.__run_clock)
+
+    def load(self) -> None:
+        """ runs the loader if extractor was successful """
+        if self.__run_load and self.extracted():
+            self.__share_run_clock(self.__loader)
+            self.__loader.load()
+            self.__is_loaded = self.__loader.loaded()
+
+    def transform(self) -> None:
+        """ runs the transformer if extractor and loader were successful """
+        if self.__run_transform and self.extracted() and self.loaded():
+            self.__share_run_clock(self.__transformer)
+            self.__transformer.transform()
+            self.__is_transformed = self.__transformer.transformed()
+
     def extract(self) -> None:
-        """ runs the extraction of data and logs the results """
-        method = f"{inspect.currentframe().f_code.co_name}()"
-        timeout = 240
+        """ runs the extraction of data and logs the results (blocking) """
+        method = "extract()"
+        if not self.__run_extract:
+            return
         print(f"{method} processing: '{self.__staging_table}'")
         try:
             # each arg separated by comma ',' and convert pathlib object to string
             print(f"{' '.join(self.__cmd_args)}")
-            # universal_newlines=True to return text not byte stream, shell=False if args=list
+            # byte streams decoded line by line, shell=False if args=list
             with subprocess.Popen(
                     args=self.__cmd_args,
                     shell=False,
-                    universal_newlines=True,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
             ) as proc:
-                # blocking wait, subprocess already logs info/errors
-                proc_stdout, proc_stderr = proc.communicate(input=None, timeout=timeout)
-                print(f"{proc_stdout}")
-                if proc_stderr:
-                    stderr = str(proc_stderr).replace('\n', '')
-                    self.__log_info(
-                        msg=f"{method} returncode: {proc.returncode} = '{os.strerror(proc.returncode)}'"
-                            f"stderr: {stderr}"
-                        )
-                # only update flag if extractor returns successfully
-                if proc.returncode == 0:
-                    self.__is_extracted = True
+                try:
+                    proc_stderr = self.__stream_extractor(proc)
+                except subprocess.TimeoutExpired:
+                    self.__log_info(msg=f"{method} {FAILURE} subprocess ({EXTRACT_TIMEOUT}s) timeout expired")
+                    proc.kill()
+                    proc.communicate()
+                    return
+                self.__log_extract_result(
+                    method=method,
+                    returncode=proc.returncode,
+                    proc_stdout="",
+                    proc_stderr=proc_stderr,
+                )
         except FileNotFoundError:
             self.__log_exception(error_msg=f"{method} {FAILURE} subprocess.Popen command line")
-        except subprocess.TimeoutExpired:
-            self.__log_info(msg=f"{method} {FAILURE} subprocess ({timeout}s) timeout expired")
+
+    def __stream_extractor(self, proc: subprocess.Popen) -> str:
+        """ prints extractor stdout line by line as it arrives (constant memory, early sign of hangs),
+        returns stderr, raises TimeoutExpired if extractor runs longer than EXTRACT_TIMEOUT """
+        if os.name != "posix":
+            # select() only supports pipes on posix: blocking wait
+            proc_stdout, proc_stderr = proc.communicate(input=None, timeout=EXTRACT_TIMEOUT)
+            print(proc_stdout.decode(errors="replace"))
+            return proc_stderr.decode(errors="replace")
+        deadline = time.monotonic() + EXTRACT_TIMEOUT
+        stderr_lines = []
+        # incomplete last line of each pipe, until newline or EOF
+        partial = {proc.stdout.fileno(): b"", proc.stderr.fileno(): b""}
+        emit_line = {
+            proc.stdout.fileno(): lambda line: print(line, end=""),
+            proc.stderr.fileno(): stderr_lines.append,
+        }
+        with selectors.DefaultSelector() as selector:
+            for pipe_fd in partial:
+                selector.register(pipe_fd, selectors.EVENT_READ)
+            while selector.get_map():
+                events = selector.select(timeout=deadline - time.monotonic())
+                if not events:
+                    proc.kill()
+                    raise subprocess.TimeoutExpired(cmd=proc.args, timeout=EXTRACT_TIMEOUT)
+                for key, _ in events:
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        # EOF: flush remainder without newline
+                        if partial[key.fd]:
+                            emit_line[key.fd](f"{partial[key.fd].decode(errors='replace')}\n")
+                        selector.unregister(key.fd)
+                        continue
+                    *lines, partial[key.fd] = (partial[key.fd] + chunk).split(b"\n")
+                    for line in lines:
+                        emit_line[key.fd](f"{line.decode(errors='replace')}\n")
+        self.__wait_extractor(proc, timeout=max(deadline - time.monotonic(), 0))
+        return "".join(stderr_lines)
+
+    @staticmethod
+    def __wait_extractor(proc: subprocess.Popen, timeout: float) -> int:
+        """ event-wait on extractor exit with pidfd + select (Linux >= 5.3) instead of polling """
+        try:
+            pidfd = os.pidfd_open(proc.pid)
+        except (AttributeError, OSError):
+            # pidfd not supported by platform/kernel
+            return proc.wait(timeout=timeout)
+        try:
+            # pidfd becomes readable when process exits
+            readable, _, _ = select.select([pidfd], [], [], timeout)
+        finally:
+            os.close(pidfd)
+        if not readable:
             proc.kill()
+            raise subprocess.TimeoutExpired(cmd=proc.args, timeout=EXTRACT_TIMEOUT)
+        return proc.wait()
+
+    async def extract_async(self) -> None:
+        """ runs the extraction of data in subprocess without blocking the event loop and logs the results """
+        method = "extract_async()"
+        if not self.__run_extract:
+            return
+        print(f"{method} processing: '{self.__staging_table}'")
+        try:
+            # each arg separated by comma ',' and convert pathlib object to string
+            print(f"{' '.join(self.__cmd_args)}")
+            proc = await asyncio.create_subprocess_exec(
+                *self.__cmd_args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            try:
+                # stdout/stderr pipes drained concurrently, subprocess already logs info/errors
+                proc_stdout, proc_stderr = await asyncio.wait_for(proc.communicate(), timeout=EXTRACT_TIMEOUT)
+            except asyncio.TimeoutError:
+                self.__log_info(msg=f"{method} {FAILURE} subprocess ({EXTRACT_TIMEOUT}s) timeout expired")
+                proc.kill()
+                await proc.wait()
+                return
+            self.__log_extract_result(
+                method=method,
+                returncode=proc.returncode,
+                proc_stdout=proc_stdout.decode(errors="replace"),
+                proc_stderr=proc_stderr.decode(errors="replace"),
+            )
+        except FileNotFoundError:
+            self.__log_exception(error_msg=f"{method} {FAILURE} create_subprocess_exec command line")
+
+    def __log_extract_result(self, method: str, returncode: int, proc_stdout: str, proc_stderr: str) -> None:
+        """prints extractor output, logs stderr and only updates flag if extractor returns successfully"""
+        if proc_stdout:
+            print(f"{proc_stdout}")
+        stderr = str(proc_stderr).replace('\n', '') if proc_stderr else ""
+        if returncode == 0:
+            self.__is_extracted = True
+            if stderr:
+                self.__log_info(msg=f"{method} returncode: {returncode} stderr: {stderr}")
+        else:
+            self.__log_info(
+                msg=f"{method} {FAILURE} returncode: {returncode} = '{get_exit_reason(returncode)}' "
+                    f"stderr: {stderr}"
+                )
 
     def extracted(self) -> bool:
         """ returns status of extractor"""
@@ -13,6 +13,8 @@ helper module for datetime functions
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import functools
+from typing import Union
 from pathlib import Path
 from datetime import datetime, timedelta, timezone
 import pytz
@@ -21,28 +23,69 @@ MODULE_NAME = Path(__file__).resolve().name
 CWD_PATH = Path(__file__).resolve().parent
 
 
+@functools.lru_cache(maxsize=None)
 def get_time_zone(tzinfo="America/Los_Angeles"):
     """
-    return validated time zone
+    return validated time zone (cached, zoneinfo is only loaded once per name)
     """
-    valid_tz = "UTC"
-    if tzinfo in pytz.common_timezones:
-        valid_tz = tzinfo
-    return pytz.timezone(valid_tz)
+    try:
+        return pytz.timezone(tzinfo)
+    except (pytz.UnknownTimeZoneError, AttributeError):
+        return pytz.timezone("UTC")
+
+
+class RunClock:
+    """ captures now() once, so every timestamp derived during an ETL run shares one instant """
+
+    def __init__(self, tz=None):
+        """ initialize class """
+        self.now = datetime.now(tz=get_time_zone(tz) if tz else get_time_zone())
+
+    def __repr__(self) -> str:
+        """returns official string representation of class, called by repr()"""
+        return f"{type(self).__name__} {self.now.isoformat()}"
+
+    @functools.cached_property
+    def date_today(self) -> str:
+        """format: YYYY-MM-DD"""
+        return self.now.strftime("%Y-%m-%d")
+
+    @functools.cached_property
+    def etl_pull_date(self) -> str:
+        """format: YYYY-MM-DD HH:MM:SS (no AM/PM or timezone)"""
+        return self.now.strftime("%Y-%m-%d %H:%M:%S")
+
+    @functools.cached_property
+    def local_etl_pull_date(self) -> str:
+        """format: YYYY-MM-DD HH:MM:SS in system local time (same instant, like naive datetime.now())"""
+        return self.now.astimezone().strftime("%Y-%m-%d %H:%M:%S")
 
+    @functools.cached_property
+    def timestamp(self) -> str:
+        """format: YYYY-MM-DD HH:MM:SS AM/PM PST/EST"""
+        return self.now.strftime("%Y-%m-%d %H:%M:%S %p %Z")
 
-def get_start_end_dates(days_ago: int = 14) -> tuple:
+
+def get_now(clock: RunClock = None) -> datetime:
+    """returns now() of clock if provided, otherwise current time (based on timezone)"""
+    return clock.now if clock else datetime.now(tz=get_time_zone())
+
+
+def get_start_end_dates(days_ago: int = 14, clock: RunClock = None) -> tuple:
     """returns strings for two dates since today (based on timezone)"""
-    curr_end_date = datetime.now(tz=get_time_zone())
+    curr_end_date = get_now(clock)
     past_start_date = curr_end_date - timedelta(days=days_ago)
     return past_start_date.strftime("%Y-%m-%d"), curr_end_date.strftime("%Y-%m-%d")
 
 
-def parse_date_str(date_str="2022-01-01", date_fmt="%Y-%m-%d") -> datetime:
-    """attempt to convert date with specific date format
+@functools.lru_cache(maxsize=1024)
+def parse_date_str(date_str: Union[str, datetime] = "2022-01-01", date_fmt="%Y-%m-%d") -> datetime:
+    """attempt to convert date with specific date format (cached, datetime objects returned as is)
        strptime: convert string to datetime object
        strftime: convert datetime object back to string
     https://docs.python.org/3/library/datetime.html#strftime-strptime-behavior"""
+    if isinstance(date_str, datetime):
+        return date_str
     date_obj = None
     try:
         date_obj = datetime.strptime(date_str, date_fmt)
@@ -51,97 +94,102 @@ def parse_date_str(date_str="2022-01-01", date_fmt="%Y-%m-%d") -> datetime:
     return date_obj
 
 
-def calculate_days_since(date_str="2022-01-01") -> int:
-    """returns number of days between now() and date string"""
+def calculate_days_since(date_str: Union[str, datetime] = "2022-01-01") -> int:
+    """returns number of days between now() and date string (or datetime)"""
     days_ago = 0
-    curr_date = datetime.now()
     hist_date = parse_date_str(date_str=date_str, date_fmt="%Y-%m-%d")
     if isinstance(hist_date, datetime):
+        # timezone aware datetime compared to now() in same timezone
+        curr_date = datetime.now(tz=hist_date.tzinfo)
         days_ago = (curr_date - hist_date).days
     return int(days_ago)
 
 
-def get_historical_date(days_ago: int = 5) -> str:
+def get_historical_date(days_ago: int = 5, clock: RunClock = None) -> str:
     """returns strings for two dates (based on timezone)"""
-    curr_date = datetime.now(tz=get_time_zone())
+    curr_date = get_now(clock)
     hist_date = curr_date - timedelta(days=days_ago)
     return hist_date.strftime("%Y-%m-%d")
 
 
-def get_date_today() -> str:
+def get_date_today(clock: RunClock = None) -> str:
     """Generates timestamp string from now() used to tag resources format: YYYY-MM-DD"""
-    date_today = datetime.now(tz=get_time_zone()).strftime("%Y-%m-%d")
-    return f"{date_today}"
+    return (clock or RunClock()).date_today
 
 
-def get_etl_pull_date() -> str:
+def get_etl_pull_date(clock: RunClock = None) -> str:
     """
     Generates timestamp string from now() used to tag resources
     format: YYYY-MM-DD HH:MM:SS (no AM/PM or timezone)
     """
-    etl_pull_date = datetime.now(tz=get_time_zone()).strftime("%Y-%m-%d %H:%M:%S")
-    return f"{etl_pull_date}"
+    return (clock or RunClock()).etl_pull_date
 
 
-def get_timestamp(path_version=False) -> str:
+def get_timestamp(path_version=False, clock: RunClock = None) -> str:
     """
     Generates timestamp string from now() used to tag resources with AM/PM and timezone
     format: YYYY-MM-DD HH:MM:SS AM/PM PST/EST
     """
-    time_now = datetime.now(tz=get_time_zone()).strftime("%Y-%m-%d %H:%M:%S %p %Z")
+    time_now = (clock or RunClock()).timestamp
     if path_version:
         # if file path: replace colon with hyphen and space with underscore
         time_now = time_now.replace(":", "-").replace(" ", "_")
     return f"{time_now}"
 
 
-def get_start_current_month() -> datetime:
+def get_start_current_month(clock: RunClock = None) -> datetime:
     """Generates timestamp from now() for first day (midnight) of current calendar month:"""
-    start_current_month_dt = datetime.now(tz=get_time_zone()).replace(microsecond=0)
+    start_current_month_dt = get_now(clock).replace(microsecond=0)
     return start_current_month_dt.replace(day=1, hour=0, minute=0, second=0)
 
 
-def get_end_current_month() -> datetime:
+def get_end_current_month(clock: RunClock = None) -> datetime:
     """Generates timestamp string from now() for last day of current calendar month:"""
-    date_today_dt = datetime.now(tz=get_time_zone()).replace(microsecond=0)
+    date_today_dt = get_now(clock).replace(microsecond=0)
     next_month_dt = date_today_dt.replace(day=28) + timedelta(days=4)
     end_of_month_dt = next_month_dt - timedelta(days=next_month_dt.day)
     return end_of_month_dt.replace(hour=23, minute=59, second=59)
 
 
-def get_end_last_month() -> datetime:
+def get_end_last_month(clock: RunClock = None) -> datetime:
     """Generates timestamp from now() for last day at 23:59:59 of current calendar month:"""
-    return get_start_current_month() - timedelta(seconds=1)
+    return get_start_current_month(clock=clock) - timedelta(seconds=1)
 
 
-def is_start_of_month() -> bool:
+def is_start_of_month(clock: RunClock = None) -> bool:
     """
-    Checks if timestamp from now() is after first day at midnight of current calendar month
+    Checks if timestamp from now() is on first day of current calendar month
     """
-    method = f"{inspect.currentframe().f_code.co_name}()"
-    is_first = False
-    timestamp_now_dt = datetime.now(tz=get_time_zone()).replace(microsecond=0)
-    start_current_month_dt = get_start_current_month()
-    diff_ts = timestamp_now_dt - start_current_month_dt
-    if timestamp_now_dt.day == start_current_month_dt.day:
-        is_first = True
-    return is_first
-
-
-def get_date_range(start_date="2022-01-01", end_date="2022-01-07", date_fmt="%Y-%m-%d", tzinfo=timezone.utc) -> list:
-    """returns list of timezone aware datetime objects"""
-    date_range = []
-    start_date = parse_date_str(date_str=start_date, date_fmt=date_fmt)
-    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=tzinfo)
+    return get_now(clock).day == 1
 
-    end_date = parse_date_str(date_str=end_date, date_fmt=date_fmt)
-    end_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0, tzinfo=tzinfo)
 
-    next_date = start_date
-    while next_date <= end_date:
-        date_range.append(next_date)
-        next_date += timedelta(days=1)
-    return date_range
+def get_date_range(
+        start_date: Union[str, datetime] = "2022-01-01",
+        end_date: Union[str, datetime] = "2022-01-07",
+        date_fmt="%Y-%m-%d",
+        tzinfo=timezone.utc,
+) -> list:
+    """returns list of timezone aware datetime objects (midnight of each day in tzinfo)"""
+    start_date = parse_date_str(date_str=start_date, date_fmt=date_fmt)
+    end_date = parse_date_str(date_str=end_date, date_fmt=date_fmt)
+    if not (isinstance(start_date, datetime) and isinstance(end_date, datetime)):
+        return []
+    # calendar dates are used as is, any timezone of datetime input is replaced by tzinfo
+    start_date = start_date.replace(tzinfo=None)
+    end_date = end_date.replace(tzinfo=None)
+    # imported here: keeps module import light for callers that never build ranges
+    import pandas as pd
+
+    # vectorized localize, nonexistent/ambiguous midnights (DST change at 00:00) resolved like pytz localize()
+    midnights = pd.date_range(
+        start=start_date.date(),
+        end=end_date.date(),
+        freq="D",
+        tz=tzinfo,
+        ambiguous=False,
+        nonexistent="shift_forward",
+    )
+    return midnights.to_pydatetime().tolist()
 
 
 if __name__ == "__main__":
@@ -21,6 +21,11 @@ ERROR = "ERROR:"
 FAILURE = "FAILURE:"
 WARNING = "WARNING:"
 
+# case in-sensitive string values parsed as boolean True
+TRUE_VALUES = frozenset({"true", "t", "yes", "y", "1"})
+# case in-sensitive string values parsed as boolean False
+FALSE_VALUES = frozenset({"false", "f", "no", "n", "0"})
+
 TIMEZONES = {
     "eastern": {"zone": "America/New_York", "abbr": "EST", "utc": "UTC-5"},
     "central": {"zone": "America/Chicago", "abbr": "CST", "utc": "UTC-6"},
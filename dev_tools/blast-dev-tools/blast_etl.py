@@ -13,21 +13,64 @@ helper module for ETL functions
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-import inspect
+import io
+import os
+import csv
+from typing import Optional
 from pathlib import Path
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
 from blast_logging import log_exception, log_info, setup_logger
-from blast_defaults import SUCCESS, FAILURE, WARNING, ERROR
+from blast_defaults import SUCCESS, FAILURE, WARNING, ERROR, TRUE_VALUES, FALSE_VALUES
+from blast_datetime import RunClock
+from EtlProcessor import EtlProcessor
 import blast_etl_dtypes as dtypes
 
 MODULE_NAME = Path(__file__).resolve().name
 CWD_PATH = Path(__file__).resolve().parent
 
+# ./blast_developer_tools/tmp/
+TMP_PATH = Path(CWD_PATH.parent.parent, "tmp")
+
+# OBJECT_MAP pandas types converted by pyarrow while parsing '.csv' files
+ARROW_TYPE_MAP = {
+    "object": pa.string(),
+    "int64": pa.int64(),
+    "float64": pa.float64(),
+    "bool": pa.bool_(),
+    "date64": pa.date32(),
+    "datetime64": pa.timestamp("s"),
+}
+# bool column values for pyarrow csv parser (case sensitive): lower, UPPER and Title case
+ARROW_TRUE_VALUES = sorted({case for val in TRUE_VALUES for case in (val, val.upper(), val.title())})
+ARROW_FALSE_VALUES = sorted({case for val in FALSE_VALUES for case in (val, val.upper(), val.title())})
+BOOL_TEXT_LOOKUP = np.array([None, "true", "false"], dtype=object)
+# file suffix: arrow codec (streaming, compression runs outside the GIL)
+ARROW_COMPRESSION = {".gzip": "gzip", ".bz2": "bz2", ".zst": "zstd"}
+CSV_COMPRESSION = ["gzip", "bz2", "zstd"]
+CSV_DATE_FORMAT = "%Y-%m-%d"
+ARROW_READ_OPTIONS = pacsv.ReadOptions(use_threads=True, block_size=8 << 20)
+ARROW_PARSE_OPTIONS = pacsv.ParseOptions(delimiter=",")
+
+
+def build_arrow_column_types() -> dict:
+    """returns {column: pyarrow type} for every field in OBJECT_MAP"""
+    column_types = {}
+    for field_lut in dtypes.OBJECT_MAP.values():
+        for field, pd_type in field_lut.items():
+            column_types.setdefault(field, ARROW_TYPE_MAP.get(pd_type, pa.string()))
+    return column_types
+
+
+ARROW_COLUMN_TYPES = build_arrow_column_types()
+
 
 def get_staging_tables(subfolder="subfolder1") -> list:
     """include_all=False: use single staging table provided from command line args"""
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "get_staging_tables()"
     staging_tables = []
     valid_directories = list(dtypes.DW_TABLE_MAP.keys())
     if subfolder in valid_directories:
@@ -37,58 +80,186 @@ def get_staging_tables(subfolder="subfolder1") -> list:
     return staging_tables
 
 
+def run_etl_processor(etl_processor: EtlProcessor) -> bool:
+    """runs a single EtlProcessor (module level so it can be pickled by ProcessPoolExecutor)"""
+    etl_processor.run()
+    return etl_processor.successful()
+
+
+def run_all(
+        staging_tables: list,
+        extractor_path: Path,
+        cmd_args: list,
+        loader_factory,
+        transformer_factory,
+        tmp_path: Path = TMP_PATH,
+        max_workers: int = None,
+        logger=None,
+) -> dict:
+    """runs one EtlProcessor per staging table concurrently, returns {staging_table: successful}
+    loader_factory, transformer_factory: callables returning a new loader/transformer for a staging table
+    one RunClock per call, handed to loaders/transformers implementing set_run_clock(run_clock)
+    (pass it to std_dtypes so every staging table of the run gets the same etl_pull_date)
+    each extractor gets its own '--tmp-dir' (by staging table) so concurrent extracts don't clobber one another
+    """
+    method = "run_all()"
+    results = {}
+    run_clock = RunClock()
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        futures = {}
+        for staging_table in staging_tables:
+            tmp_dir = Path(tmp_path, staging_table)
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            etl_processor = EtlProcessor(
+                staging_table=staging_table,
+                extractor_path=extractor_path,
+                cmd_args=[*cmd_args, "--tmp-dir", tmp_dir],
+                loader=loader_factory(staging_table),
+                transformer=transformer_factory(staging_table),
+                run_clock=run_clock,
+                logger=logger,
+            )
+            futures[executor.submit(run_etl_processor, etl_processor)] = staging_table
+        for future in as_completed(futures):
+            staging_table = futures[future]
+            try:
+                results[staging_table] = future.result()
+            except Exception:
+                results[staging_table] = False
+                log_exception(logger=logger, error_msg=f"{method} {FAILURE} '{staging_table}'")
+                continue
+            status = SUCCESS if results[staging_table] else FAILURE
+            log_info(logger=logger, msg=f"{method} {status} '{staging_table}'")
+    return results
+
+
 def set_difference(src_A: list, dst_B: list) -> list:
     """returns set difference of src_A and dst_B
     A\\B or A-B = {x: x ∈ A and x ∉ B} a.k.a LEFT OUTER JOIN
     only values in src_A that are NOT in dst_B are returned"""
     diff_list = []
     if isinstance(src_A, list) and isinstance(dst_B, list):
-        diff_list = sorted(list(set(src_A) - set(dst_B)))
+        diff_list = sorted(set(src_A).difference(dst_B))
+    return diff_list
+
+
+def set_difference_preset(src_A: list, dst_B_set: frozenset) -> list:
+    """returns set difference of src_A and pre-built dst_B_set (set or frozenset)
+    avoids re-hashing dst_B when diffing many src_A lists against the same dst_B"""
+    diff_list = []
+    if isinstance(src_A, list) and isinstance(dst_B_set, (set, frozenset)):
+        diff_list = sorted(set(src_A).difference(dst_B_set))
     return diff_list
 
 
 def print_dtypes(title: str, ds: pd.Series, show_numbers: bool = True) -> None:
     """ displays dataframe dtypes (pd.Series) to console output """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "print_dtypes()"
     if isinstance(ds, pd.Series):
-        count = 0
         print(f"\n{method} {title}")
-        for key, val in ds.iteritems():
+        for count, (key, val) in enumerate(zip(ds.index, ds.values)):
             if show_numbers:
                 print(f"\t{str(val):16}\t{key:48}\tcol_{count:02}")
             else:
                 print(f"\t{str(val):16}\t{key:48}")
-            count += 1
     else:
         print(f"{method} {FAILURE} invalid type {type(ds)}")
 
 
-def std_dtypes(sf_object: str, df: pd.DataFrame, logger=None) -> pd.DataFrame:
-    """convert data types in pandas as needed"""
-    method = f"{inspect.currentframe().f_code.co_name}()"
+def parse_naive_timestamp(value) -> pd.Timestamp:
+    """parse single value to timestamp, timezone dropped (wall time kept)"""
+    timestamp = pd.to_datetime(value, errors="coerce")
+    if timestamp is not pd.NaT and timestamp.tzinfo is not None:
+        return timestamp.tz_localize(None)
+    return timestamp
+
+
+def to_naive_datetime(values: pd.Series) -> pd.Series:
+    """parse to datetime, timezone dropped from tz-aware values (wall time kept, no UTC conversion)"""
+    try:
+        parsed = pd.to_datetime(values, errors="coerce")
+    except ValueError:
+        # mixed utc offsets in one column: no common timezone
+        parsed = None
+    if parsed is None or parsed.dtype == object:
+        # slow path: each value parsed on its own
+        return pd.to_datetime(values.map(parse_naive_timestamp), errors="coerce")
+    if isinstance(parsed.dtype, pd.DatetimeTZDtype):
+        return parsed.dt.tz_localize(None)
+    return parsed
+
+
+def bool_to_text(bool_df: pd.DataFrame) -> np.ndarray:
+    """returns 'true'/'false' for explicit true/false values (TRUE_VALUES/FALSE_VALUES), anything else None
+    bool dtypes (bool, boolean, bool[pyarrow]) need no string pass, text columns normalized once as a block"""
+    is_bool_dtype = bool_df.dtypes.map(pd.api.types.is_bool_dtype).to_numpy(dtype=bool)
+    is_true = np.zeros(bool_df.shape, dtype=bool)
+    is_false = np.zeros(bool_df.shape, dtype=bool)
+    if is_bool_dtype.any():
+        native = bool_df.loc[:, is_bool_dtype]
+        is_null = native.isna().to_numpy()
+        native_true = native.fillna(False).to_numpy(dtype=bool)
+        is_true[:, is_bool_dtype] = native_true & ~is_null
+        is_false[:, is_bool_dtype] = ~native_true & ~is_null
+    if not is_bool_dtype.all():
+        text = bool_df.loc[:, ~is_bool_dtype]
+        # single vectorized string pass over flattened block (not per column)
+        flat = pd.Series(text.to_numpy(dtype=object).ravel()).astype("string").str.strip().str.lower()
+        is_true[:, ~is_bool_dtype] = flat.isin(TRUE_VALUES).to_numpy(dtype=bool).reshape(text.shape)
+        is_false[:, ~is_bool_dtype] = flat.isin(FALSE_VALUES).to_numpy(dtype=bool).reshape(text.shape)
+    # lookup by code (0: None, 1: true, 2: false), avoids building numpy unicode arrays
+    return BOOL_TEXT_LOOKUP[is_true.astype(np.int8) + 2 * is_false.astype(np.int8)]
+
+
+def group_columns_by_type(cols: pd.Index) -> list:
+    """returns [float, bool, timestamp, date, int] column groups, string columns excluded,
+    a field typed differently across OBJECT_MAP objects only lands in first matching group"""
+    assigned = cols.isin(dtypes.ALL_STRING_SET)
+    column_groups = []
+    for type_set in (
+            dtypes.ALL_FLOAT_SET,
+            dtypes.ALL_BOOL_SET,
+            dtypes.ALL_TIMESTAMP_SET,
+            dtypes.ALL_DATE_SET,
+            dtypes.ALL_INT_SET,
+    ):
+        mask = cols.isin(type_set) & ~assigned
+        assigned |= mask
+        column_groups.append(cols[mask])
+    return column_groups
+
+
+def std_dtypes(sf_object: str, df: pd.DataFrame, logger=None, clock: RunClock = None) -> pd.DataFrame:
+    """convert data types in pandas as needed (one vectorized conversion per dtype group)
+    clock: RunClock of current run, etl_pull_date is its system local time (naive, as datetime.now()),
+    defaults to new RunClock (now)"""
+    method = "std_dtypes()"
     pd_float_64 = pd.Float64Dtype()
     pd_int_64 = pd.Int64Dtype()
     try:
-        col_list = df.columns.values.tolist()
-        for col_name in col_list:
-            if col_name in dtypes.ALL_STRING_COLUMNS:
-                continue
-            if col_name in dtypes.ALL_FLOAT_COLUMNS:
-                df[col_name] = pd.to_numeric(df[col_name], errors="coerce", downcast=None)
-                df[col_name] = df[col_name].astype(dtype=pd_float_64, errors="ignore")
-            elif col_name in dtypes.ALL_BOOL_COLUMNS:
-                df[col_name] = df[col_name].map({True: "true", False: "false"})
-            elif col_name in dtypes.ALL_TIMESTAMP_COLUMNS:
-                df[col_name] = pd.to_datetime(df[col_name], errors="coerce")
-                df[col_name] = df[col_name].dt.strftime("%Y-%m-%d %H:%M:%S")
-            elif col_name in dtypes.ALL_DATE_COLUMNS:
-                df[col_name] = pd.to_datetime(df[col_name], errors="coerce")
-                df[col_name] = df[col_name].dt.strftime("%Y-%m-%d")
-            elif col_name in dtypes.ALL_INT_COLUMNS:
-                df[col_name] = pd.to_numeric(df[col_name], errors="coerce", downcast=None)
-                df[col_name] = df[col_name].astype(dtype=pd_int_64, errors="ignore")
+        # boolean mask per dtype group from hashed Index (same precedence as per column elif chain)
+        float_cols, bool_cols, timestamp_cols, date_cols, int_cols = group_columns_by_type(df.columns)
+        if not float_cols.empty:
+            df[float_cols] = df[float_cols].apply(pd.to_numeric, errors="coerce")
+            df[float_cols] = df[float_cols].astype(dtype=pd_float_64, errors="ignore")
+        if not bool_cols.empty:
+            df[bool_cols] = bool_to_text(df[bool_cols])
+        if not timestamp_cols.empty:
+            # kept as datetime64[s], written as 'YYYY-MM-DD HH:MM:SS' by pyarrow csv writer
+            # timezone dropped from offset/zone values, wall time kept (astype rejects tz-aware)
+            df[timestamp_cols] = df[timestamp_cols].apply(to_naive_datetime)
+            df[timestamp_cols] = df[timestamp_cols].astype("datetime64[s]")
+        if not date_cols.empty:
+            # numpy day resolution formatter (C loop) instead of per row strftime, NaT as null
+            dates = df[date_cols].apply(pd.to_datetime, errors="coerce").to_numpy(dtype="datetime64[D]")
+            date_strs = dates.astype(str).astype(object)
+            date_strs[np.isnat(dates)] = None
+            df[date_cols] = date_strs
+        if not int_cols.empty:
+            df[int_cols] = df[int_cols].apply(pd.to_numeric, errors="coerce")
+            df[int_cols] = df[int_cols].astype(dtype=pd_int_64, errors="ignore")
         # df.drop_duplicates(keep="last", inplace=True)
-        pull_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        pull_date = (clock or RunClock()).local_etl_pull_date
         df["etl_pull_date"] = pull_date
         log_info(logger=logger, msg=f"{method} {SUCCESS} pull_date: '{pull_date}'")
         return df
@@ -97,21 +268,54 @@ def std_dtypes(sf_object: str, df: pd.DataFrame, logger=None) -> pd.DataFrame:
         return pd.DataFrame()
 
 
+def open_csv_source(file_path: Path) -> pa.NativeFile:
+    """ memory maps uncompressed '.csv' file (parser reads page cache without copies),
+    compressed files are streamed through arrow codec (mmap doesn't help compressed data) """
+    compression = ARROW_COMPRESSION.get(file_path.suffix)
+    if compression:
+        return pa.input_stream(str(file_path), compression=compression)
+    return pa.memory_map(str(file_path), "r")
+
+
+def read_csv_header(file_path: Path) -> list:
+    """ returns column names from first line of source '.csv' file (compressed or not)
+    utf-8-sig: a UTF-8 BOM is not kept in first column name (arrow skips it as well) """
+    with open_csv_source(file_path) as src:
+        return next(csv.reader(io.TextIOWrapper(src, encoding="utf-8-sig", newline="")), [])
+
+
+def read_csv_to_table(file_path: Path, column_types: dict) -> pa.Table:
+    """ parse source '.csv' file to arrow table (multithreaded), converting columns to column_types """
+    with open_csv_source(file_path) as src:
+        return pacsv.read_csv(
+            src,
+            read_options=ARROW_READ_OPTIONS,
+            parse_options=ARROW_PARSE_OPTIONS,
+            convert_options=pacsv.ConvertOptions(
+                column_types=column_types,
+                true_values=ARROW_TRUE_VALUES,
+                false_values=ARROW_FALSE_VALUES,
+            ),
+        )
+
+
 def read_csv_to_df(file_path: Path, logger=None) -> pd.DataFrame:
-    """ import source '.csv' file to pandas dataframe """
+    """ import source '.csv' file to pandas dataframe (arrow backed) """
     try:
         if isinstance(file_path, Path) and file_path.is_file():
-            if file_path.suffix in [".csv", ".gzip", ".bz2"]:
-                df = pd.read_csv(
-                    file_path,
-                    sep=",",
-                    engine="c",
-                    encoding="utf-8",
-                    na_filter=False,
-                    keep_default_na=True,
-                    dtype=object,
-                    low_memory=False,
-                )
+            if file_path.suffix in [".csv", ".gzip", ".bz2", ".zst"]:
+                # columns not in OBJECT_MAP are kept as strings (no type inference)
+                header = read_csv_header(file_path)
+                if not header:
+                    log_info(logger=logger, msg=f"{WARNING} '{file_path.name}' empty (no header)")
+                    return pd.DataFrame()
+                column_types = {col: ARROW_COLUMN_TYPES.get(col, pa.string()) for col in header}
+                try:
+                    table = read_csv_to_table(file_path, column_types)
+                except pa.ArrowInvalid:
+                    log_info(logger=logger, msg=f"{WARNING} '{file_path.name}' invalid values, read as strings")
+                    table = read_csv_to_table(file_path, dict.fromkeys(header, pa.string()))
+                df = table.to_pandas(types_mapper=pd.ArrowDtype)
                 if isinstance(df, pd.DataFrame):
                     return df
     except (AttributeError, ValueError, pd.errors.DtypeWarning):
@@ -119,10 +323,35 @@ def read_csv_to_df(file_path: Path, logger=None) -> pd.DataFrame:
     return pd.DataFrame()
 
 
+def format_csv_dates(df: pd.DataFrame) -> pd.DataFrame:
+    """ datetime columns formatted as '%Y-%m-%d' text (same as df.to_csv(date_format=...)) """
+    datetime_cols = [col for col, dtype in df.dtypes.items() if pd.api.types.is_datetime64_any_dtype(dtype)]
+    if datetime_cols:
+        df = df.copy(deep=False)
+        for col in datetime_cols:
+            df[col] = df[col].dt.strftime(CSV_DATE_FORMAT)
+    return df
+
+
+def df_to_arrow_table(df: pd.DataFrame) -> Optional[pa.Table]:
+    """ convert dataframe to arrow table, object columns of mixed python types converted to strings
+    returns None for nested values (dict/list), not supported by the arrow csv writer """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. [1, "A2", None]: arrow can't infer one type, written as text like df.to_csv()
+        object_cols = df.columns[df.dtypes == object]
+        table = pa.Table.from_pandas(df.astype({col: "string" for col in object_cols}), preserve_index=False)
+    if any(pa.types.is_nested(field.type) for field in table.schema):
+        return None
+    return table
+
+
 def write_df_to_csv(output_path: Path, df: pd.DataFrame, compression=None, header=True, logger=None) -> None:
-    """ exports dataframe to comma-delimited, fully-quoted '.csv' file (where csv.QUOTE_ALL = 1)"""
-    method = f"{inspect.currentframe().f_code.co_name}()"
-    if compression not in ["gzip", "bz2"]:
+    """ exports dataframe to comma-delimited, fully-quoted '.csv' file (nulls written unquoted)
+    compression: 'gzip', 'bz2' or 'zstd' (fastest at similar ratio), otherwise uncompressed"""
+    method = "write_df_to_csv()"
+    if compression not in CSV_COMPRESSION:
         compression = None
     if isinstance(output_path, Path) and isinstance(df, pd.DataFrame):
         try:
@@ -130,22 +359,24 @@ def write_df_to_csv(output_path: Path, df: pd.DataFrame, compression=None, heade
             if row_count > 0:
                 if not output_path.parent.exists():
                     output_path.parent.mkdir(parents=True, exist_ok=True)
-                df.to_csv(
-                    output_path,
-                    sep=",",
-                    date_format="%Y-%m-%d",
-                    encoding="utf-8",
-                    quoting=1,
-                    quotechar='"',
-                    compression=compression,
-                    index=False,
-                    header=header,
-                )
+                df = format_csv_dates(df)
+                table = df_to_arrow_table(df)
+                if compression:
+                    sink = pa.CompressedOutputStream(str(output_path), compression)
+                else:
+                    sink = pa.OSFile(str(output_path), "wb")
+                with sink:
+                    if table is None:
+                        # case: dict/list values, written as text by the pandas writer
+                        df.to_csv(sink, sep=",", encoding="utf-8", quoting=csv.QUOTE_ALL, quotechar='"', index=False, header=header)
+                    else:
+                        write_options = pacsv.WriteOptions(include_header=header, quoting_style="all_valid")
+                        pacsv.write_csv(table, sink, write_options=write_options)
                 if output_path.is_file():
                     log_info(logger=logger, msg=f"{method} {SUCCESS} '{output_path.name}' ({row_count} ROWS)")
             else:
                 log_info(logger=logger, msg=f"{method} {WARNING} dataframe empty (no rows) '{output_path.name}'")
-        except (OSError, ValueError, pd.errors.DtypeWarning):
+        except (OSError, ValueError, pd.errors.DtypeWarning, pa.ArrowException):
             log_exception(logger=logger, error_msg=f"{method} {FAILURE} '{output_path}'")
     else:
         log_info(logger=logger, msg=f"{method} {FAILURE} invalid types: {type(output_path)} {type(df)}")
@@ -69,30 +69,48 @@ OBJECT_MAP = {
     },
 }
 
-ALL_STRING_COLUMNS = []
-ALL_INT_COLUMNS = []
-ALL_FLOAT_COLUMNS = []
-ALL_BOOL_COLUMNS = []
-ALL_DATE_COLUMNS = []
-ALL_TIMESTAMP_COLUMNS = []
-ALL_COLUMNS = []
+# dict keys as insertion ordered sets: O(1) de-duplication, first-seen field order
+string_fields = {}
+int_fields = {}
+float_fields = {}
+bool_fields = {}
+date_fields = {}
+timestamp_fields = {}
+all_fields = {}
 
 for obj_name, field_lut in OBJECT_MAP.items():
     for field, pd_type in field_lut.items():
-        if "object" in pd_type and field not in ALL_STRING_COLUMNS:
-            ALL_STRING_COLUMNS.append(field)
-        elif "int64" in pd_type and field not in ALL_INT_COLUMNS:
-            ALL_INT_COLUMNS.append(field)
-        elif "float64" in pd_type and field not in ALL_FLOAT_COLUMNS:
-            ALL_FLOAT_COLUMNS.append(field)
-        elif "bool" in pd_type and field not in ALL_BOOL_COLUMNS:
-            ALL_BOOL_COLUMNS.append(field)
-        elif "date64" in pd_type and field not in ALL_DATE_COLUMNS:
-            ALL_DATE_COLUMNS.append(field)
-        elif "datetime64" in pd_type and field not in ALL_TIMESTAMP_COLUMNS:
-            ALL_TIMESTAMP_COLUMNS.append(field)
-        if field not in ALL_COLUMNS:
-            ALL_COLUMNS.append(field)
+        if "object" in pd_type:
+            string_fields[field] = None
+        elif "int64" in pd_type:
+            int_fields[field] = None
+        elif "float64" in pd_type:
+            float_fields[field] = None
+        elif "bool" in pd_type:
+            bool_fields[field] = None
+        elif "date64" in pd_type:
+            date_fields[field] = None
+        elif "datetime64" in pd_type:
+            timestamp_fields[field] = None
+        all_fields[field] = None
+
+ALL_STRING_COLUMNS = list(string_fields)
+ALL_INT_COLUMNS = list(int_fields)
+ALL_FLOAT_COLUMNS = list(float_fields)
+ALL_BOOL_COLUMNS = list(bool_fields)
+ALL_DATE_COLUMNS = list(date_fields)
+ALL_TIMESTAMP_COLUMNS = list(timestamp_fields)
+ALL_COLUMNS = list(all_fields)
+
+# hashed lookups for column classification
+ALL_STRING_SET = frozenset(string_fields)
+ALL_INT_SET = frozenset(int_fields)
+ALL_FLOAT_SET = frozenset(float_fields)
+ALL_BOOL_SET = frozenset(bool_fields)
+ALL_DATE_SET = frozenset(date_fields)
+ALL_TIMESTAMP_SET = frozenset(timestamp_fields)
+# scratch ordered sets not part of module API
+del string_fields, int_fields, float_fields, bool_fields, date_fields, timestamp_fields, all_fields
 
 PD_TYPE_MAP = {
     "object": ALL_STRING_COLUMNS,
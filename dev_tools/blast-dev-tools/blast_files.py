@@ -14,15 +14,38 @@ helper module for file utility functions
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
-import inspect
+import re
 import json
+import mmap
+import stat
 import string
 import random
 import hashlib
 import uuid
 import shutil
 import pprint as pp
+from typing import Iterator, Optional
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    # optional: falls back to stdlib json
+    orjson = None
+
+try:
+    import blake3
+except ImportError:
+    # optional: blake3 checksum not available
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    # optional: xxh3_128 checksum not available
+    xxhash = None
+
 from blast_logging import log_exception, log_info, setup_logger
 from blast_defaults import SUCCESS, ERROR, FAILURE
 
@@ -31,22 +54,65 @@ CWD_PATH = Path(__file__).resolve().parent
 
 # ./blast_developer_tools/data/
 DATA_PATH = Path(CWD_PATH.parent.parent, "data")
-VALID_EXTENSIONS = [".csv", ".gzip", ".bz2", ".json"]
-
-
-def print_data(title: str, data: object) -> None:
-    """displays all data values to console as formatted string"""
+VALID_EXTENSIONS = frozenset({".csv", ".gzip", ".bz2", ".json"})
+HASH_TYPES = {
+    "sha224": hashlib.sha224,
+    "sha256": hashlib.sha256,
+    "sha384": hashlib.sha384,
+    "sha512": hashlib.sha512,
+    "sha3_224": hashlib.sha3_224,
+    "sha3_256": hashlib.sha3_256,
+    "sha3_512": hashlib.sha3_512,
+}
+# non-cryptographic integrity checks (SIMD hashing, much faster than SHA-3 in software)
+if blake3:
+    HASH_TYPES["blake3"] = blake3.blake3
+if xxhash:
+    HASH_TYPES["xxh3_128"] = xxhash.xxh3_128
+# fixed default (same key and digest on every host), blake3/xxh3_128 requested explicitly via enc_type
+CHECKSUM_TYPE = "sha3_224"
+CHECKSUM_CHUNK_SIZE = 1 << 20
+PURGE_MAX_WORKERS = 32
+PURGE_EXTENSIONS = (".csv", ".gzip", ".bz2", ".json")
+# 2 space indent and str() non-str keys like json.dumps(indent=2), but not byte identical:
+# non-ASCII written unescaped, NaN/Infinity written as null, ints wider than 64 bits raise
+ORJSON_OPTIONS = (orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS) if orjson else None
+# mmap only pays off for large files, capped to spare memory constrained hosts
+CHECKSUM_MMAP_MIN_SIZE = 16 * 1024 * 1024
+CHECKSUM_MMAP_MAX_SIZE = 512 * 1024 * 1024
+AVOID_ITEMS = [
+    ".keep",
+    "touch",
+    ".lock",
+    ".txt",
+    ".DS_Store",
+    "test_",
+    ".toml",
+    ".properties",
+]
+# single literal-alternation scan instead of one substring test per item
+AVOID_PATTERN = re.compile("|".join(map(re.escape, AVOID_ITEMS)))
+RANDOM_TEXT_ALPHABET = (string.ascii_letters + string.punctuation + string.digits).encode("ascii")
+RANDOM_TEXT_TABLE = bytes(RANDOM_TEXT_ALPHABET[b % len(RANDOM_TEXT_ALPHABET)] for b in range(256))
+
+
+def print_data(title: str, data: object, fast: bool = False) -> None:
+    """displays all data values to console as formatted string
+    fast=True: plain print(), skips pprint layout (for repeated calls)
+    """
     if data:
         print(f"\n{title}")
-        pp.pprint(data, indent=2, width=180, compact=False, sort_dicts=False)
+        if fast:
+            print(data)
+        else:
+            pp.pprint(data, indent=2, width=180, compact=False, sort_dicts=False)
 
 
 def touch_file(file_path: Path) -> bool:
     """exist_ok is true, FileExistsError exceptions will be ignored
     (same behavior as the POSIX mkdir -p command)"""
     is_created = False
-    if not file_path.parent.exists():
-        file_path.parent.mkdir(parents=True, exist_ok=True)
+    file_path.parent.mkdir(parents=True, exist_ok=True)
     if not file_path.is_file():
         # only touch if file does not exist
         file_path.touch(mode=0o777, exist_ok=True)
@@ -54,48 +120,63 @@ def touch_file(file_path: Path) -> bool:
     return is_created
 
 
-def is_valid_file(file_path: Path) -> bool:
-    """Checks if file: exists, is not directory, has correct extension and data"""
+def is_valid_file(file_path: Path, file_stat: Optional[os.stat_result] = None) -> bool:
+    """Checks if file: exists, is not directory, has correct extension and data
+    file_stat: optional cached stat result (e.g. DirEntry.stat()) skips the stat call
+    """
     is_valid = False
-    if isinstance(file_path, Path) and file_path.is_file():
-        if file_path.suffix in VALID_EXTENSIONS:
-            if file_path.stat().st_size > 1:
-                is_valid = True
+    if isinstance(file_path, Path) and file_path.suffix in VALID_EXTENSIONS:
+        try:
+            if file_stat is None:
+                # single stat call for both file type and size
+                file_stat = file_path.stat()
+            is_valid = stat.S_ISREG(file_stat.st_mode) and file_stat.st_size > 1
+        except OSError:
+            pass
     return is_valid
 
 
-def get_file_size(file_path: Path) -> int:
+def get_file_size(file_path: Path, file_stat: Optional[os.stat_result] = None) -> int:
     """Checks if file exists, is not directory, has correct extension, returns file_size in bytes"""
     file_size = 0
-    if isinstance(file_path, Path) and file_path.is_file():
-        if file_path.suffix in VALID_EXTENSIONS:
-            file_size = file_path.stat().st_size
+    if isinstance(file_path, Path) and file_path.suffix in VALID_EXTENSIONS:
+        try:
+            if file_stat is None:
+                file_stat = file_path.stat()
+            if stat.S_ISREG(file_stat.st_mode):
+                file_size = file_stat.st_size
+        except OSError:
+            pass
     return int(file_size)
 
 
-def get_checksum(file_path: Path, enc_type: str = "sha3_224") -> dict:
+def get_checksum(file_path: Path, enc_type: str = CHECKSUM_TYPE) -> dict:
     """returns hash of file contents, MD5/SHA1 have collisions
     SHA-2: sha224, sha256, sha384, sha512,
     SHA-3: sha3_224, sha3_256, sha3_512
+    optional (integrity only): blake3, xxh3_128
     """
     checksum = {}
     if isinstance(file_path, Path) and file_path.is_file():
+        if enc_type not in HASH_TYPES:
+            # case: invalid input
+            enc_type = "sha3_256"
+        file_size = file_path.stat().st_size
         # open as binary
         with open(str(file_path), "rb") as file_ptr:
-            read_data = file_ptr.read()
-            if enc_type == "sha224":
-                sha_hash = hashlib.sha1(read_data)
-            elif enc_type == "sha256":
-                sha_hash = hashlib.sha256(read_data)
-            elif enc_type == "sha512":
-                sha_hash = hashlib.sha512(read_data)
-            elif enc_type == "sha3_224":
-                sha_hash = hashlib.sha3_224(read_data)
+            if CHECKSUM_MMAP_MIN_SIZE <= file_size <= CHECKSUM_MMAP_MAX_SIZE:
+                # large files hashed in place from the page cache (no read copies)
+                sha_hash = HASH_TYPES[enc_type]()
+                with mmap.mmap(file_ptr.fileno(), 0, access=mmap.ACCESS_READ) as mem_map:
+                    sha_hash.update(mem_map)
+            elif hasattr(hashlib, "file_digest"):
+                # python 3.11+: file fed to OpenSSL in C (SHA-NI/AVX2 code paths)
+                sha_hash = hashlib.file_digest(file_ptr, HASH_TYPES[enc_type])
             else:
-                # case: invalid input
-                enc_type = "sha3_256"
-                sha_hash = hashlib.sha3_256(read_data)
-            file_ptr.close()
+                # hashed in fixed size chunks (constant memory)
+                sha_hash = HASH_TYPES[enc_type]()
+                while chunk := file_ptr.read(CHECKSUM_CHUNK_SIZE):
+                    sha_hash.update(chunk)
         checksum[enc_type] = str(sha_hash.hexdigest().upper())
     return checksum
 
@@ -108,41 +189,49 @@ def get_uuid_tag(trunc_len: int = 8) -> str:
 def is_not_config(file_path: Path) -> bool:
     """return True if all items to avoid are not in file_path"""
     if isinstance(file_path, Path):
-        avoid_items = [
-            ".keep",
-            "touch",
-            ".lock",
-            ".txt",
-            ".DS_Store",
-            "test_",
-            ".toml",
-            ".properties",
-        ]
-        for item in avoid_items:
-            if item in str(file_path):
-                return False
+        return is_not_config_str(str(file_path))
     return True
 
 
+def is_not_config_str(file_path: str) -> bool:
+    """return True if all items to avoid are not in file path string (no Path object needed)"""
+    return AVOID_PATTERN.search(file_path) is None
+
+
 def get_directories_by_keyword(file_path: Path, keyword: str) -> list:
     """ non-recursive search for directory paths by keyword """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "get_directories_by_keyword()"
     dir_list = []
     if isinstance(file_path, Path):
         if file_path.exists():
-            dir_list = [p.name for p in file_path.glob(f"*{keyword}*") if p.is_dir() and is_not_config(p)]
+            # DirEntry caches file type from directory read (no stat per entry)
+            with os.scandir(file_path) as entries:
+                dir_list = [
+                    entry.name
+                    for entry in entries
+                    if keyword in entry.name and entry.is_dir() and is_not_config_str(entry.path)
+                ]
     else:
         print(f"{method} {ERROR} invalid type: {type(file_path)}")
     return sorted(dir_list)
 
 
+def iter_files_by_extension(file_path, file_ext: str = ".csv") -> Iterator[os.DirEntry]:
+    """ lazily yield non-recursive file entries by file extension (or tuple of extensions) """
+    if os.path.isdir(file_path):
+        # DirEntry caches file type from directory read (no stat per entry)
+        with os.scandir(os.path.abspath(file_path)) as entries:
+            for entry in entries:
+                if entry.name.endswith(file_ext) and entry.is_file() and is_not_config_str(entry.path):
+                    yield entry
+
+
 def get_files_by_extension(file_path: Path, file_ext: str = ".csv") -> list:
-    """ get non-recursive file paths by file extension """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    """ get non-recursive absolute file path strings by file extension (or tuple of extensions) """
+    method = "get_files_by_extension()"
     path_list = []
     if isinstance(file_path, Path):
-        if file_path.exists():
-            path_list = [p.absolute() for p in file_path.glob(f"*{file_ext}") if p.is_file() and is_not_config(p)]
+        path_list = [entry.path for entry in iter_files_by_extension(file_path, file_ext)]
     else:
         print(f"{method} {ERROR} invalid type: {type(file_path)}")
     return sorted(path_list)
@@ -176,8 +265,7 @@ def copy_all_files(src_path: Path, dst_path: Path) -> bool:
             src_count = len(src_path_list)
 
             dst_path = Path(dst_path)
-            if not dst_path.parent.exists():
-                dst_path.parent.mkdir(parents=True, exist_ok=True)
+            dst_path.parent.mkdir(parents=True, exist_ok=True)
 
             for src_filepath in src_path_list:
                 shutil.copy2(src_filepath, dst_path)
@@ -190,20 +278,43 @@ def copy_all_files(src_path: Path, dst_path: Path) -> bool:
     return src_count == dst_count
 
 
+def remove_file(file_path) -> OSError:
+    """removes file, returns OSError instead of raising (None if removed)"""
+    try:
+        os.remove(file_path)
+    except OSError as error:
+        return error
+    return None
+
+
 def purge_prior_extract(file_path: Path, logger=None):
     """removes files from prior ETL processing"""
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "purge_prior_extract()"
+    if not isinstance(file_path, Path):
+        print(f"{method} {ERROR} invalid type: {type(file_path)}")
+        return
     try:
-        all_paths = []
         purged_files = []
-        for file_ext in [".csv", ".gzip", ".bz2", ".json"]:
-            all_paths.extend(get_files_by_extension(file_path, file_ext))
-        for remove_path in all_paths:
-            os.remove(remove_path)
-            purged_files.append(remove_path.name)
+        failed_files = []
+        # single directory pass for all extensions, unlinks dispatched as entries are read
+        # (unlink is metadata latency bound and releases the GIL, overlap in threads)
+        with ThreadPoolExecutor(max_workers=PURGE_MAX_WORKERS) as executor:
+            remove_futures = {
+                executor.submit(remove_file, entry.path): entry.name
+                for entry in iter_files_by_extension(file_path, PURGE_EXTENSIONS)
+            }
+        for remove_future, file_name in remove_futures.items():
+            remove_error = remove_future.result()
+            if remove_error is None:
+                purged_files.append(file_name)
+            else:
+                failed_files.append(f"{file_name} ({remove_error.strerror})")
+        purged_files.sort()
         purge_count = len(purged_files)
         if purge_count > 0:
             log_info(logger=logger, msg=f"{method} removed {purge_count} file(s) {purged_files}")
+        if failed_files:
+            log_info(logger=logger, msg=f"{method} {FAILURE} {len(failed_files)} file(s) {failed_files}")
     except (OSError, PermissionError):
         log_exception(logger=logger, error_msg=f"{method} {FAILURE} {file_path}")
 
@@ -225,53 +336,70 @@ def join_sub_folder(cwd_path=DATA_PATH, folders=["subdir1", "subdir2"], filename
             subdir_list = [folders]
     subdir_list.append(filename)
     child_path = cwd_path.joinpath(*subdir_list)
-    if not child_path.parent.exists():
-        child_path.parent.mkdir(parents=True, exist_ok=True)
+    # touch_file creates parent directories
     touch_file(child_path)
     return child_path
 
 
 def read_json(file_path: Path, logger=None) -> dict:
     """ open and read source '.json' file """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "read_json()"
     try:
         if file_path.is_file():
-            with open(file_path, "r", encoding="utf-8") as json_file:
-                json_data = json.load(json_file)
-                json_file.close()
-                if not json_data:
-                    log_info(logger=logger, msg=f"{method} EMPTY: {file_path.name}")
-                return json_data
+            with open(file_path, "rb") as json_file:
+                json_bytes = json_file.read()
+            json_data = None
+            if orjson:
+                try:
+                    json_data = orjson.loads(json_bytes)
+                except orjson.JSONDecodeError:
+                    # e.g. NaN/Infinity written by stdlib json: parsed by stdlib json below
+                    json_data = None
+            if json_data is None:
+                json_data = json.loads(json_bytes)
+            if not json_data:
+                log_info(logger=logger, msg=f"{method} EMPTY: {file_path.name}")
+            return json_data
     except (OSError, TypeError, ValueError, json.JSONDecodeError):
         log_exception(logger=logger, error_msg=f"{method} {FAILURE} '{file_path.name}'")
     return None
 
 
-def write_json(output_path: Path, data: dict, logger=None) -> None:
-    """ exports request data to '.json' formatted file. """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+def write_json(output_path: Path, data: dict, logger=None, stream: bool = False) -> None:
+    """ exports request data to '.json' formatted file.
+    stream=True: incremental json.dump (lower peak memory for large payloads)
+    """
+    method = "write_json()"
     try:
-        if not output_path.parent.exists():
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         if data:
-            with open(output_path, "w", encoding="utf-8") as json_file:
-                formatted_str = json.dumps(data, indent=2, sort_keys=False)
-                json_file.write(formatted_str)
-                json_file.close()
+            json_bytes = None
+            if orjson and not stream:
+                try:
+                    # serialized straight to utf-8 bytes (no intermediate str)
+                    json_bytes = orjson.dumps(data, option=ORJSON_OPTIONS)
+                except orjson.JSONEncodeError:
+                    # e.g. int wider than 64 bits: written by stdlib json below
+                    json_bytes = None
+            if json_bytes is not None:
+                with open(output_path, "wb") as json_file:
+                    json_file.write(json_bytes)
+            else:
+                # written in chunks as encoded (no fully materialized str)
+                with open(output_path, "w", encoding="utf-8") as json_file:
+                    json.dump(data, json_file, indent=2, sort_keys=False)
     except (OSError, TypeError, ValueError, json.JSONDecodeError):
         log_exception(logger=logger, error_msg=f"{method} {FAILURE} '{output_path}'")
 
 
 def write_txt(output_path: Path, data: str, logger=None) -> None:
     """ exports string to '.txt' file """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "write_txt()"
     if isinstance(output_path, Path) and data:
-        if not output_path.parent.exists():
-            output_path.parent.mkdir(parents=True, exist_ok=True)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         try:
             with open(output_path, "w", encoding="utf-8") as txt_file:
                 txt_file.write(str(data))
-                txt_file.close()
                 log_info(logger=logger, msg=f"{method} {SUCCESS} {output_path.name}")
         except (OSError, ValueError):
             log_exception(logger=logger, error_msg=f"{method} {ERROR} {output_path.name}")
@@ -287,7 +415,7 @@ def generate_random_data(file_path, binary=False, megabytes=0.01, logger=None) -
     :param mega_bytes: file size in megabytes (1024 base)
     :return: bool if created
     """
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "generate_random_data()"
     is_generated = False
     # convert megabytes to bytes
     file_size_bytes = int(megabytes * 1024 * 1024)
@@ -298,20 +426,10 @@ def generate_random_data(file_path, binary=False, megabytes=0.01, logger=None) -
                 fp.write(os.urandom(int(file_size_bytes)))
         else:
             file_path = Path(file_path.parent, f"{file_path.name}")
-            with open(file_path, "w") as fp:
-                letters = []
-                letters.extend(string.ascii_letters)
-                letters.extend(string.punctuation)
-                letters.extend(string.digits)
-                random.shuffle(letters)
-                diff_size = file_size_bytes
-                while diff_size > 0:
-                    random_str = "".join([random.choice(letters) for c in range(1, len(letters))])
-                    if len(random_str) <= diff_size:
-                        bytes_written = fp.write(random_str)
-                    else:
-                        bytes_written = fp.write(random_str[:diff_size])
-                    diff_size -= bytes_written
+            with open(file_path, "wb") as fp:
+                # test data only: Mersenne Twister bytes (no CSPRNG syscalls),
+                # mapped onto the printable alphabet in one C-level pass
+                fp.write(random.randbytes(file_size_bytes).translate(RANDOM_TEXT_TABLE))
 
         stat_size = file_path.stat().st_size
         if file_path.is_file() and stat_size >= file_size_bytes:
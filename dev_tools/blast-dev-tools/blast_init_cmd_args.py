@@ -14,41 +14,54 @@ helper module for command line argument and initialization functions
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import os
+import sys
 import argparse
-import inspect
+import functools
 from pathlib import Path
-import toml
 
-from blast_defaults import SUCCESS, FAILURE
+try:
+    import tomllib
+except ImportError:
+    # python < 3.11
+    import tomli as tomllib
+
+from blast_defaults import SUCCESS, FAILURE, TRUE_VALUES
 from blast_logging import log_exception, log_info
 
 MODULE_NAME = Path(__file__).resolve().name
 CWD_PATH = Path(__file__).resolve().parent
+VALID_TABLES = frozenset({"stg_data1", "stg_data2"})
+VALID_DB_ENV = frozenset({"development", "production"})
+
+
+@functools.lru_cache(maxsize=8)
+def load_toml(config_path: Path, mtime_ns: int, size: int) -> dict:
+    """parsed '.toml' config, cached by path, modified time and size (re-parsed on change)"""
+    with open(config_path, "rb") as file_ptr:
+        return tomllib.load(file_ptr)
 
 
 def parse_toml(config_path=Path(CWD_PATH, "config", "blast_cfg_example.toml"), logger=None) -> bool:
     """extracts values from '.toml' config file."""
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "parse_toml()"
     is_parsed = False
     try:
-        if config_path.is_file() and config_path.stat().st_size > 0:
-            config = toml.load(config_path)
+        config_stat = config_path.stat() if config_path.is_file() else None
+        if config_stat and config_stat.st_size > 0:
+            config = load_toml(config_path, config_stat.st_mtime_ns, config_stat.st_size)
             os.environ["ETL_NAME"] = config['etl']['name']
             os.environ["ETL_TIMEZONE"] = config["etl"]["timezone"]
             log_info(logger=logger, msg=f"{method} {SUCCESS} {config_path.name}")
             is_parsed = True
         else:
             raise FileNotFoundError
-    except (KeyError, FileNotFoundError):
+    except (KeyError, FileNotFoundError, tomllib.TOMLDecodeError):
         log_exception(logger=logger, error_msg=f"{method} {FAILURE} {config_path.name}")
     return is_parsed
 
 
-def parse_cmd_args(logger=None) -> dict:
-    """ parse command line arguments"""
-    method = f"{inspect.currentframe().f_code.co_name}()"
-    valid_tbl = ["stg_data1", "stg_data2"]
-    valid_db_env = ["development", "production"]
+def build_arg_parser() -> argparse.ArgumentParser:
+    """ command line argument parser (built once at import) """
     parser = argparse.ArgumentParser()
     parser.add_argument(
         "-d",
@@ -66,7 +79,7 @@ def parse_cmd_args(logger=None) -> dict:
         type=str,
         required=False,
         default="development",
-        help=f"enter valid database environment: {valid_db_env}",
+        help=f"enter valid database environment: {sorted(VALID_DB_ENV)}",
     )
     parser.add_argument(
         "-s",
@@ -86,8 +99,18 @@ def parse_cmd_args(logger=None) -> dict:
         default="True",
         help="include_all=True: process all, if False: process single",
     )
+    return parser
+
+
+ARG_PARSER = build_arg_parser()
+
+
+@functools.lru_cache(maxsize=8)
+def parse_args(argv: tuple) -> dict:
+    """ parsed and normalized arguments, memoized by argv (tuple: hashable cache key) """
+    method = "parse_args()"
     # convert parser to dict with vars()
-    args = vars(parser.parse_args())
+    args = vars(ARG_PARSER.parse_args(list(argv)))
 
     days_ago = int(args["days_ago"])
     if days_ago < 0:
@@ -96,18 +119,26 @@ def parse_cmd_args(logger=None) -> dict:
     args["days_ago"] = days_ago
 
     db_environment = args["db_environment"]
-    if db_environment not in valid_db_env:
-        parser.error(f"'{db_environment}' not in {valid_db_env}")
+    if db_environment not in VALID_DB_ENV:
+        ARG_PARSER.error(f"'{db_environment}' not in {sorted(VALID_DB_ENV)}")
 
     staging_table = args["staging_table"]
-    if staging_table not in valid_tbl:
-        parser.error(f"'{staging_table}' not in {valid_tbl}")
+    if staging_table not in VALID_TABLES:
+        ARG_PARSER.error(f"'{staging_table}' not in {sorted(VALID_TABLES)}")
 
     include_all = args["include_all"]
-    if include_all.lower() in ["true", "t", "yes", "y", "1"]:
+    if include_all.lower() in TRUE_VALUES:
         args["include_all"] = True
     else:
         args["include_all"] = False
+    return args
+
+
+def parse_cmd_args(logger=None) -> dict:
+    """ parse command line arguments"""
+    method = "parse_cmd_args()"
+    # copy: callers may modify result without changing cached value
+    args = dict(parse_args(tuple(sys.argv[1:])))
     log_info(logger=logger, msg=f"{method} {args}")
     return args
 
@@ -15,20 +15,28 @@ helper module for logging and environment functions
 # limitations under the License.
 import os
 import sys
-import inspect
 import logging
 from pathlib import Path
 import platform
 import json
+import copy
+import socket
+import functools
 from datetime import datetime
 import pprint as pp
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
-import pkg_resources
+from importlib.metadata import distributions
+from blast_defaults import TRUE_VALUES
 
 MODULE_PATH = Path(__file__).resolve()
 # ./blast_developer_tools/logs/
 CWD_PATH = MODULE_PATH.parent.parent
+LOG_FORMAT = "%(asctime)s [%(levelname)s] pid:%(process)d | %(filename)s:%(lineno)d | %(message)s"
+LOG_FORMATTER = logging.Formatter(fmt=LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S.%M %Z")
+ISP_INFO_URL = "http://ipinfo.io/json"
+# seconds, default socket timeout may block indefinitely
+ISP_INFO_TIMEOUT = 2.0
 
 
 def setup_logger(
@@ -39,19 +47,22 @@ def setup_logger(
     if not log_file.parent.exists():
         log_file.parent.mkdir(parents=True, exist_ok=True)
     logger = logging.getLogger(str(src_file))
+    if logger.handlers:
+        # already configured: re-attaching handlers would duplicate every record
+        return logger
     logger.setLevel(logging.INFO)
-    log_format = "%(asctime)s [%(levelname)s] pid:%(process)d | %(filename)s:%(lineno)d | %(message)s"
-    formatter = logging.Formatter(fmt=log_format, datefmt="%Y-%m-%d %H:%M:%S.%M %Z")
-    # create a file handler
-    file_handler = logging.FileHandler(str(log_file))
+    # records handled here only, not emitted again through the root logger
+    logger.propagate = False
+    # create a file handler (file opened on first record)
+    file_handler = logging.FileHandler(str(log_file), delay=True)
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(LOG_FORMATTER)
     logger.addHandler(file_handler)
     # also print STDOUT to console for debugging
     if std_out:
         stdout_handler = logging.StreamHandler(sys.stdout)
         stdout_handler.setLevel(logging.INFO)
-        stdout_handler.setFormatter(formatter)
+        stdout_handler.setFormatter(LOG_FORMATTER)
         logger.addHandler(stdout_handler)
     return logger
 
@@ -73,20 +84,34 @@ def log_exception(logger=None, error_msg: str = None) -> None:
     logger.error(exc_msg) if logger else print(exc_msg)
 
 
+@functools.lru_cache(maxsize=1)
+def fetch_isp_info() -> dict:
+    """ISP information of connected host, fetched once per process.
+    raises on network errors (not cached, next call retries the lookup)"""
+    isp_req = Request(ISP_INFO_URL)
+    with urlopen(isp_req, timeout=ISP_INFO_TIMEOUT) as isp_resp:
+        isp_info = json.load(isp_resp)
+    if "readme" in isp_info:
+        del isp_info["readme"]
+    return isp_info
+
+
 def get_isp_sys_info() -> dict:
     """Get current ISP and system information of connected host."""
-    isp_req = Request("http://ipinfo.io/json")
     isp_data = {"isp_info": {"hostname": "localhost"}}
     try:
-        isp_data["isp_info"].update(json.load(urlopen(isp_req)))
+        # copy: callers may modify result without changing cached value
+        isp_data["isp_info"].update(copy.deepcopy(fetch_isp_info()))
     except HTTPError as ex:
         isp_data["status"] = f"HTTPError code: {ex.code} {ex.reason}"
     except URLError as ex:
         isp_data["status"] = f"URLError: {ex.reason}"
+    except socket.timeout:
+        isp_data["status"] = f"timeout: {ISP_INFO_TIMEOUT} seconds"
+    except OSError as ex:
+        isp_data["status"] = f"OSError: {ex}"
     isp_data["isp_info"]["arch"] = f"{platform.system()} {platform.architecture()[0]} " f"{platform.machine()}"
     isp_data["isp_info"]["time"] = datetime.now().strftime("%Y-%m-%d %I:%M:%S %p")
-    if "readme" in isp_data["isp_info"]:
-        del isp_data["isp_info"]["readme"]
     pp.pprint(isp_data, indent=2, width=72, compact=False, sort_dicts=False)
     return isp_data
 
@@ -140,12 +165,12 @@ def get_relevant_env_vars(include_all=False) -> dict:
 
 def set_env_variable(key="PY_ENVIRONMENT", val="production") -> None:
     """Set environmental variables: DEV, STG, PROD"""
-    method = f"{inspect.currentframe().f_code.co_name}()"
+    method = "set_env_variable()"
     # for value to string
     os.environ[key] = str(val)
     result = False
     if isinstance(val, bool):
-        result = bool(os.environ.get(key).lower() in ["true", "t", "yes", "y", "1"])
+        result = bool(os.environ.get(key).lower() in TRUE_VALUES)
     elif isinstance(val, str):
         result = os.environ.get(key)
     if result != val:
@@ -170,11 +195,10 @@ def check_platform() -> str:
 
 def show_installed_packages() -> None:
     """Returns currently installed python packages on host."""
-    working_set = list(pkg_resources.working_set)
-    # case insensitive sorting
+    # stdlib metadata scan (no setuptools import), set drops duplicate sys.path entries
     installed_pkgs = sorted(
-        [f"{pkg.project_name:}=={pkg.version}" for pkg in working_set],
-        key=lambda s: s.lower(),
+        {f"{dist.metadata['Name']}=={dist.version}" for dist in distributions() if dist.metadata["Name"]},
+        key=str.lower,
     )
     for i, pkg in enumerate(installed_pkgs, start=1):
         print(f"\tpkg_{i:02}\t {pkg}")
@@ -1,9 +1,13 @@
 from setuptools import setup, find_packages
 
 requirements = [
-    "pandas",
+    # pd.ArrowDtype
+    "pandas>=2.0",
+    # pyarrow.csv.WriteOptions(quoting_style=...)
+    "pyarrow>=12.0",
+    "numpy",
     "pytz",
-    "toml",
+    "tomli; python_version < '3.11'",
 ]
 
 setup(
@@ -15,4 +19,5 @@ setup(
     python_requires=">=3.9,<4.0",
     packages=find_packages(),
     install_requires=requirements,
+    extras_require={"speedups": ["orjson", "blake3", "xxhash"]},
 )
@@ -0,0 +1,20 @@
+"""
+pytest configuration: modules under test are imported from parent directory
+"""
+# Copyright 2021, Blast Analytics & Marketing
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import sys
+from pathlib import Path
+
+# ./blast-dev-tools/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,77 @@
+"""
+tests for EtlPipeline: results in processor order and shared run clock
+"""
+# Copyright 2021, Blast Analytics & Marketing
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import pytest
+
+from EtlPipeline import EtlPipeline
+from EtlProcessor import EtlProcessor
+
+
+class StageStub:
+    """ loader/transformer stand-in, records run clock handed over by EtlProcessor """
+
+    def __init__(self):
+        self.run_clock = None
+        self.is_done = False
+
+    def set_run_clock(self, run_clock) -> None:
+        self.run_clock = run_clock
+
+    def load(self) -> None:
+        self.is_done = True
+
+    def transform(self) -> None:
+        self.is_done = True
+
+    def loaded(self) -> bool:
+        return self.is_done
+
+    def transformed(self) -> bool:
+        return self.is_done
+
+
+@pytest.fixture
+def extractor_path(tmp_path):
+    """ extractor exits with returncode passed as first argument """
+    file_path = tmp_path / "extractor.py"
+    file_path.write_text("import sys\nsys.exit(int(sys.argv[1]))\n", encoding="utf-8")
+    return file_path
+
+
+def test_run_results_in_processor_order(extractor_path):
+    returncodes = [0, 1, 0]
+    stages = [(StageStub(), StageStub()) for _ in returncodes]
+    # same staging table name: results must not collide
+    etl_processors = [
+        EtlProcessor(
+            staging_table="account",
+            extractor_path=extractor_path,
+            cmd_args=[returncode],
+            loader=loader,
+            transformer=transformer,
+        )
+        for returncode, (loader, transformer) in zip(returncodes, stages)
+    ]
+    results = EtlPipeline(etl_processors, extract_workers=2, load_workers=1, transform_workers=1).run()
+    assert results == [True, False, True]
+    run_clocks = {id(stage.run_clock) for loader, transformer in stages for stage in (loader, transformer)
+                  if stage.is_done}
+    # successful processors share one run clock
+    assert len(run_clocks) == 1 and stages[0][0].run_clock is not None
+    assert stages[1][0].run_clock is None
+
+
+def test_transform_workers_default():
+    assert "transform_workers: None" not in repr(EtlPipeline([]))
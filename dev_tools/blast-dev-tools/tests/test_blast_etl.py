@@ -0,0 +1,147 @@
+"""
+tests for blast_etl: csv type mapping, bool/timestamp conversion and csv writer
+"""
+# Copyright 2021, Blast Analytics & Marketing
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gzip
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+import blast_etl
+from blast_datetime import RunClock
+
+CSV_TEXT = (
+    "id,amount,active,created,day,name\n"
+    "1,2.5,Yes,2021-01-02 03:04:05,2021-01-02,007\n"
+    "2,,n,,,x\n"
+)
+COLUMN_TYPES = {
+    "id": pa.int64(),
+    "amount": pa.float64(),
+    "active": pa.bool_(),
+    "created": pa.timestamp("s"),
+    "day": pa.date32(),
+}
+
+
+@pytest.fixture
+def column_types(monkeypatch):
+    """ OBJECT_MAP independent column types for csv parser """
+    monkeypatch.setattr(blast_etl, "ARROW_COLUMN_TYPES", COLUMN_TYPES)
+    return COLUMN_TYPES
+
+
+@pytest.mark.parametrize("file_name", ["source.csv", "source.gzip"])
+def test_read_csv_to_df_column_types(tmp_path, column_types, file_name):
+    file_path = tmp_path / file_name
+    if file_path.suffix == ".gzip":
+        file_path.write_bytes(gzip.compress(CSV_TEXT.encode("utf-8")))
+    else:
+        file_path.write_text(CSV_TEXT, encoding="utf-8")
+    df = blast_etl.read_csv_to_df(file_path)
+    for col, arrow_type in column_types.items():
+        assert df[col].dtype == pd.ArrowDtype(arrow_type)
+    # columns not in OBJECT_MAP kept as text (no type inference)
+    assert df["name"].dtype == pd.ArrowDtype(pa.string())
+    assert df["name"].tolist() == ["007", "x"]
+    assert df["active"].tolist() == [True, False]
+    assert df["amount"].isna().tolist() == [False, True]
+
+
+def test_read_csv_to_df_utf8_bom(tmp_path, column_types):
+    file_path = tmp_path / "bom.csv"
+    file_path.write_bytes(b"\xef\xbb\xbf" + CSV_TEXT.encode("utf-8"))
+    df = blast_etl.read_csv_to_df(file_path)
+    assert df.columns[0] == "id"
+    assert df["id"].dtype == pd.ArrowDtype(pa.int64())
+
+
+def test_read_csv_to_df_empty_file(tmp_path, column_types):
+    file_path = tmp_path / "empty.csv"
+    file_path.write_bytes(b"")
+    assert blast_etl.read_csv_to_df(file_path).empty
+
+
+def test_read_csv_to_df_invalid_values_read_as_strings(tmp_path, column_types):
+    file_path = tmp_path / "invalid.csv"
+    file_path.write_text("id,name\nA1,x\n", encoding="utf-8")
+    df = blast_etl.read_csv_to_df(file_path)
+    assert df["id"].dtype == pd.ArrowDtype(pa.string())
+    assert df["id"].tolist() == ["A1"]
+
+
+def test_bool_to_text():
+    bool_df = pd.DataFrame({
+        "text": [" Yes", "0", "maybe", None],
+        "native": pd.array([True, False, None, True], dtype="boolean"),
+    })
+    result = blast_etl.bool_to_text(bool_df)
+    assert result.tolist() == [["true", "true"], ["false", "false"], [None, None], [None, "true"]]
+
+
+def test_to_naive_datetime_keeps_wall_time():
+    values = pd.Series(["2021-01-02T03:04:05+05:00", "2021-01-02T03:04:05-08:00", None])
+    result = blast_etl.to_naive_datetime(values)
+    assert result.dt.tz is None
+    assert result.tolist()[:2] == [pd.Timestamp("2021-01-02 03:04:05")] * 2
+    assert pd.isna(result.iloc[2])
+
+
+def test_std_dtypes(monkeypatch):
+    monkeypatch.setattr(blast_etl.dtypes, "ALL_STRING_SET", frozenset({"name"}))
+    monkeypatch.setattr(blast_etl.dtypes, "ALL_FLOAT_SET", frozenset({"amount"}))
+    # field typed bool and int: first matching group (bool) wins
+    monkeypatch.setattr(blast_etl.dtypes, "ALL_BOOL_SET", frozenset({"active", "flag"}))
+    monkeypatch.setattr(blast_etl.dtypes, "ALL_TIMESTAMP_SET", frozenset({"created"}))
+    monkeypatch.setattr(blast_etl.dtypes, "ALL_DATE_SET", frozenset({"day"}))
+    monkeypatch.setattr(blast_etl.dtypes, "ALL_INT_SET", frozenset({"id", "flag"}))
+    df = pd.DataFrame({
+        "id": ["1", "x"],
+        "amount": ["2.5", ""],
+        "active": ["Y", "garbage"],
+        "flag": ["1", "0"],
+        "created": ["2021-01-02T03:04:05+05:00", None],
+        "day": ["2021-01-02 10:00:00", None],
+        "name": ["007", None],
+    })
+    clock = RunClock()
+    df = blast_etl.std_dtypes("object", df, clock=clock)
+    assert df["id"].tolist()[0] == 1 and pd.isna(df["id"].iloc[1])
+    assert df["amount"].dtype == pd.Float64Dtype()
+    assert df["active"].iloc[0] == "true" and pd.isna(df["active"].iloc[1])
+    assert df["flag"].tolist() == ["true", "false"]
+    assert df["created"].dtype == np.dtype("datetime64[s]")
+    assert df["created"].iloc[0] == pd.Timestamp("2021-01-02 03:04:05")
+    assert df["day"].iloc[0] == "2021-01-02" and pd.isna(df["day"].iloc[1])
+    assert df["name"].iloc[0] == "007"
+    assert (df["etl_pull_date"] == clock.local_etl_pull_date).all()
+
+
+def test_write_df_to_csv(tmp_path):
+    file_path = tmp_path / "output.csv"
+    df = pd.DataFrame({
+        "day": pd.to_datetime(["2021-01-02 03:04:05", None]),
+        "mixed": [1, "A2"],
+    })
+    blast_etl.write_df_to_csv(file_path, df)
+    assert file_path.read_text(encoding="utf-8") == '"day","mixed"\n"2021-01-02","1"\n,"A2"\n'
+
+
+def test_write_df_to_csv_nested_values(tmp_path):
+    file_path = tmp_path / "output.gzip"
+    df = pd.DataFrame({"data": [{"key": 1}, {"key": 2}]})
+    blast_etl.write_df_to_csv(file_path, df, compression="gzip")
+    assert gzip.decompress(file_path.read_bytes()).decode("utf-8") == "\"data\"\n\"{'key': 1}\"\n\"{'key': 2}\"\n"
@@ -0,0 +1,99 @@
+"""
+tests for blast_files: checksum code paths and json round trip
+"""
+# Copyright 2021, Blast Analytics & Marketing
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import math
+import hashlib
+
+import pytest
+
+import blast_files
+
+FILE_DATA = bytes(range(256)) * 1000
+
+
+@pytest.fixture
+def data_file(tmp_path):
+    """ binary file hashed by every checksum code path """
+    file_path = tmp_path / "data.csv"
+    file_path.write_bytes(FILE_DATA)
+    return file_path
+
+
+@pytest.fixture(params=["orjson", "json"])
+def json_module(request, monkeypatch):
+    """ runs json tests with orjson (if installed) and with stdlib json """
+    if request.param == "orjson":
+        if blast_files.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(blast_files, "orjson", None)
+    return request.param
+
+
+def expected_checksum(enc_type: str = blast_files.CHECKSUM_TYPE) -> dict:
+    return {enc_type: blast_files.HASH_TYPES[enc_type](FILE_DATA).hexdigest().upper()}
+
+
+def test_get_checksum_file_digest(data_file):
+    assert blast_files.get_checksum(data_file) == expected_checksum()
+
+
+def test_get_checksum_mmap(data_file, monkeypatch):
+    monkeypatch.setattr(blast_files, "CHECKSUM_MMAP_MIN_SIZE", 1)
+    assert blast_files.get_checksum(data_file) == expected_checksum()
+
+
+def test_get_checksum_chunked(data_file, monkeypatch):
+    monkeypatch.delattr(hashlib, "file_digest", raising=False)
+    # several chunks plus a partial last chunk
+    monkeypatch.setattr(blast_files, "CHECKSUM_CHUNK_SIZE", 1000)
+    assert blast_files.get_checksum(data_file) == expected_checksum()
+
+
+@pytest.mark.parametrize("enc_type", sorted(blast_files.HASH_TYPES))
+def test_get_checksum_enc_types(data_file, enc_type):
+    assert blast_files.get_checksum(data_file, enc_type=enc_type) == expected_checksum(enc_type)
+
+
+def test_get_checksum_invalid_enc_type(data_file):
+    assert blast_files.get_checksum(data_file, enc_type="md5") == expected_checksum("sha3_256")
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_json_round_trip(tmp_path, json_module, stream):
+    file_path = tmp_path / "data.json"
+    data = {"name": "Zoë ✓", "count": 1, "big": 2**70, "items": [1.5, None, True]}
+    blast_files.write_json(file_path, data, stream=stream)
+    assert blast_files.read_json(file_path) == data
+
+
+def test_json_non_str_keys(tmp_path, json_module):
+    file_path = tmp_path / "data.json"
+    blast_files.write_json(file_path, {1: "a"})
+    assert blast_files.read_json(file_path) == {"1": "a"}
+
+
+def test_read_json_nan_written_by_stdlib(tmp_path, json_module):
+    file_path = tmp_path / "data.json"
+    file_path.write_text(json.dumps({"nan": float("nan"), "inf": float("inf")}), encoding="utf-8")
+    data = blast_files.read_json(file_path)
+    assert math.isnan(data["nan"]) and data["inf"] == float("inf")
+
+
+def test_read_json_invalid(tmp_path, json_module):
+    file_path = tmp_path / "data.json"
+    file_path.write_text("{invalid", encoding="utf-8")
+    assert blast_files.read_json(file_path) is None